@@ -9,18 +9,75 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import json
+import ijson
 import os
+import re
 from pathlib import Path
 
+# Set up plotting style once per process
+plt.style.use('seaborn-v0_8')
+sns.set_palette("husl")
+
+# Columns consumed by the charts and summary statistics, with explicit dtypes
+# so read_csv can skip type inference and unused columns entirely. numViewers
+# is nullable so a blank cell doesn't fail the load
+ANALYSIS_DTYPES = {
+    'architecture': 'object',
+    'numViewers': 'Int64',
+    'packetLoss': 'float64',
+    'bandwidth': 'object',
+    'avgLatency': 'float64',
+    'avgCpu': 'float64',
+    'avgTls': 'float64'
+}
+
+# Flattened results.json field names mapped to their CSV column equivalents
+JSON_COLUMN_MAP = {
+    'architecture': 'architecture',
+    'numViewers': 'numViewers',
+    'packetLoss': 'packetLoss',
+    'bandwidth': 'bandwidth',
+    'metrics.latency.average': 'avgLatency',
+    'metrics.cpu.average': 'avgCpu',
+    'metrics.tls.average': 'avgTls'
+}
+
+# Axis labels for the standard bandwidth limits
+BANDWIDTH_LABELS = {
+    '1mbit': '1 Mbps',
+    '2mbit': '2 Mbps',
+    '5mbit': '5 Mbps'
+}
+
+# Bandwidth rate units relative to mbit
+BANDWIDTH_UNITS = {'k': 1e-3, 'm': 1, 'g': 1e3}
+
+def bandwidth_sort_key(label):
+    """Order bandwidth limits such as '500kbit' or '5mbit' by rate, with unparseable labels last"""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([kmg])bit', str(label).strip().lower())
+    if match is None:
+        return (1, 0.0)
+    return (0, float(match.group(1)) * BANDWIDTH_UNITS[match.group(2)])
+
+# Test configuration keys and the metrics aggregated for each configuration
+CUBE_LEVELS = ['architecture', 'numViewers', 'packetLoss', 'bandwidth']
+CUBE_METRICS = ['avgCpu', 'avgLatency', 'avgTls']
+
+# Cube key standing in for a missing bandwidth limit
+MISSING_BANDWIDTH = '<missing>'
+
+# Names used for each metric in summary_statistics.json
+SUMMARY_NAMES = {
+    'avgCpu': 'cpu_utilization',
+    'avgLatency': 'latency',
+    'avgTls': 'tls'
+}
+
 class DataAnalyzer:
     def __init__(self, results_dir='./results'):
         self.results_dir = Path(results_dir)
         self.data = None
-        
-        # Set up plotting style
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
-        
+
         # Create output directory
         self.output_dir = self.results_dir / 'visualizations'
         self.output_dir.mkdir(exist_ok=True)
@@ -34,93 +91,110 @@ class DataAnalyzer:
         
         if csv_file.exists():
             print(f"Loading CSV data from {csv_file}")
-            self.data = pd.read_csv(csv_file)
+            self.data = pd.read_csv(csv_file, usecols=lambda column: column in ANALYSIS_DTYPES,
+                                    dtype=ANALYSIS_DTYPES)
         elif json_file.exists():
             print(f"Loading JSON data from {json_file}")
-            with open(json_file, 'r') as f:
-                json_data = json.load(f)
+            # Stream the results array so failed tests are dropped as they are
+            # parsed instead of materializing the whole JSON tree first
+            with open(json_file, 'rb') as f:
+                completed = [result for result in ijson.items(f, 'results.item', use_float=True)
+                             if result.get('success') and result.get('metrics')]
             
-            # Convert JSON to DataFrame
-            results = json_data['results']
-            records = []
+            # Flatten nested metrics into dotted columns in a single pass
+            results = pd.json_normalize(completed, sep='.')
+            results = results.reindex(columns=list(JSON_COLUMN_MAP))
             
-            for result in results:
-                if result.get('success', False) and result.get('metrics'):
-                    record = {
-                        'testId': result['testId'],
-                        'architecture': result['architecture'].upper(),
-                        'numViewers': result['numViewers'],
-                        'packetLoss': result['packetLoss'],
-                        'bandwidth': result['bandwidth'],
-                        'avgLatency': result['metrics']['latency']['average'],
-                        'minLatency': result['metrics']['latency']['min'],
-                        'maxLatency': result['metrics']['latency']['max'],
-                        'avgCpu': result['metrics']['cpu']['average'],
-                        'maxCpu': result['metrics']['cpu']['max'],
-                        'avgTls': result['metrics']['tls']['average'],
-                        'minTls': result['metrics']['tls']['min']
-                    }
-                    records.append(record)
+            # Drop tests whose metrics are missing a latency measurement
+            has_metrics = results['metrics.latency.average'].notna()
             
-            self.data = pd.DataFrame(records)
+            self.data = results.loc[has_metrics]
+            self.data = self.data.rename(columns=JSON_COLUMN_MAP).reset_index(drop=True)
+            # An empty or architecture-less result set reindexes to float NaN,
+            # which the .str accessor rejects
+            self.data['architecture'] = self.data['architecture'].astype('object').str.upper()
         else:
             raise FileNotFoundError("No results.json or results.csv found in results directory")
         
+        # Same columns and dtypes whichever source was loaded; absent columns
+        # are filled with missing values rather than failing the load
+        self.data = self.data.reindex(columns=list(ANALYSIS_DTYPES)).astype(ANALYSIS_DTYPES)
+        
+        # Small vocabularies: store as integer-coded categoricals so groupby
+        # hashes codes rather than strings. Bandwidth categories come from the
+        # loaded values, ordered by rate, so no limit is coerced to NaN
+        bandwidths = sorted(self.data['bandwidth'].dropna().unique(), key=bandwidth_sort_key)
+        unknown_bandwidths = [bw for bw in bandwidths if bw not in BANDWIDTH_LABELS]
+        if unknown_bandwidths:
+            print(f"Warning: Unrecognized bandwidth limits {unknown_bandwidths}, using raw labels")
+        
+        self.data['architecture'] = self.data['architecture'].astype('category')
+        self.data['bandwidth'] = self.data['bandwidth'].astype(
+            pd.CategoricalDtype(bandwidths, ordered=True))
+        
         print(f"Loaded {len(self.data)} test results")
         print(f"Architectures: {self.data['architecture'].unique()}")
-        print(f"Viewer counts: {sorted(self.data['numViewers'].unique())}")
+        print(f"Viewer counts: {sorted(self.data['numViewers'].dropna().unique())}")
         
         return self.data
     
-    def generate_cpu_utilization_chart(self):
+    def aggregate_metrics(self):
+        """Sum and count each metric per test configuration in a single groupby pass"""
+        # groupby drops NaN keys (and pandas < 2.0 ignores dropna=False for
+        # categoricals), so give tests without a bandwidth an explicit key to
+        # keep them in the charts that don't group on bandwidth
+        bandwidth = self.data['bandwidth']
+        if bandwidth.isna().any():
+            if MISSING_BANDWIDTH not in bandwidth.cat.categories:
+                bandwidth = bandwidth.cat.add_categories(MISSING_BANDWIDTH)
+            bandwidth = bandwidth.fillna(MISSING_BANDWIDTH)
+        
+        keys = [self.data[level] for level in CUBE_LEVELS[:-1]] + [bandwidth]
+        grouped = self.data.groupby(keys, observed=True)[CUBE_METRICS]
+        return pd.concat({'sum': grouped.sum(), 'count': grouped.count()}, axis=1)
+    
+    @staticmethod
+    def cube_means(cube, levels, metric):
+        """Collapse the aggregated cube onto the given levels and return the mean of metric"""
+        totals = cube.groupby(level=levels, observed=True).sum()
+        return (totals[('sum', metric)] / totals[('count', metric)]).reset_index(name=metric)
+    
+    def generate_cpu_utilization_chart(self, cpu_grouped, ax):
         """Generate CPU Utilization vs. Number of Viewers chart (0% packet loss)"""
         print("Generating CPU utilization chart...")
         
-        # Filter data for 0% packet loss
-        cpu_data = self.data[self.data['packetLoss'] == 0.0].copy()
-        
-        if cpu_data.empty:
+        if cpu_grouped.empty:
             print("Warning: No data with 0% packet loss found for CPU chart")
             return
         
-        # Group by architecture and number of viewers, calculate mean CPU
-        cpu_grouped = cpu_data.groupby(['architecture', 'numViewers'])['avgCpu'].mean().reset_index()
-        
-        plt.figure(figsize=(10, 6))
+        ax.clear()
         
         # Plot lines for each architecture
         for arch in cpu_grouped['architecture'].unique():
             arch_data = cpu_grouped[cpu_grouped['architecture'] == arch]
-            plt.plot(arch_data['numViewers'], arch_data['avgCpu'], 
+            ax.plot(arch_data['numViewers'], arch_data['avgCpu'], 
                     marker='o', linewidth=2, label=f'{arch} Architecture', markersize=8)
         
-        plt.xlabel('Number of Viewers', fontsize=12)
-        plt.ylabel('CPU Utilization (%)', fontsize=12)
-        plt.title('Presenter CPU Utilization vs. Number of Viewers\n(0% Packet Loss)', fontsize=14, fontweight='bold')
-        plt.legend(fontsize=11)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
+        ax.set_xlabel('Number of Viewers', fontsize=12)
+        ax.set_ylabel('CPU Utilization (%)', fontsize=12)
+        ax.set_title('Presenter CPU Utilization vs. Number of Viewers\n(0% Packet Loss)', fontsize=14, fontweight='bold')
+        ax.legend(fontsize=11)
+        ax.grid(True, alpha=0.3)
+        ax.figure.tight_layout()
         
         output_path = self.output_dir / 'cpu_utilization.png'
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        ax.figure.savefig(output_path, dpi=300, bbox_inches='tight')
         print(f"CPU utilization chart saved to {output_path}")
     
-    def generate_latency_vs_loss_chart(self):
+    def generate_latency_vs_loss_chart(self, latency_grouped, ax):
         """Generate Glass-to-Glass Latency vs. Packet Loss Rate chart (N=5 viewers)"""
         print("Generating latency vs packet loss chart...")
         
-        # Filter data for N=5 viewers
-        latency_data = self.data[self.data['numViewers'] == 5].copy()
-        
-        if latency_data.empty:
+        if latency_grouped.empty:
             print("Warning: No data with 5 viewers found for latency chart")
             return
         
-        # Group by architecture and packet loss, calculate mean latency
-        latency_grouped = latency_data.groupby(['architecture', 'packetLoss'])['avgLatency'].mean().reset_index()
-        
-        plt.figure(figsize=(10, 6))
+        ax.clear()
         
         # Convert packet loss to percentage for display
         latency_grouped['packetLossPercent'] = latency_grouped['packetLoss'] * 100
@@ -128,111 +202,89 @@ class DataAnalyzer:
         # Plot lines for each architecture
         for arch in latency_grouped['architecture'].unique():
             arch_data = latency_grouped[latency_grouped['architecture'] == arch]
-            plt.plot(arch_data['packetLossPercent'], arch_data['avgLatency'], 
+            ax.plot(arch_data['packetLossPercent'], arch_data['avgLatency'], 
                     marker='s', linewidth=2, label=f'{arch} Architecture', markersize=8)
         
-        plt.xlabel('Packet Loss Rate (%)', fontsize=12)
-        plt.ylabel('Glass-to-Glass Latency (ms)', fontsize=12)
-        plt.title('Glass-to-Glass Latency vs. Packet Loss Rate\n(N=5 viewers)', fontsize=14, fontweight='bold')
-        plt.legend(fontsize=11)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
+        ax.set_xlabel('Packet Loss Rate (%)', fontsize=12)
+        ax.set_ylabel('Glass-to-Glass Latency (ms)', fontsize=12)
+        ax.set_title('Glass-to-Glass Latency vs. Packet Loss Rate\n(N=5 viewers)', fontsize=14, fontweight='bold')
+        ax.legend(fontsize=11)
+        ax.grid(True, alpha=0.3)
+        ax.figure.tight_layout()
         
         output_path = self.output_dir / 'latency_vs_loss.png'
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        ax.figure.savefig(output_path, dpi=300, bbox_inches='tight')
         print(f"Latency vs packet loss chart saved to {output_path}")
     
-    def generate_tls_vs_bandwidth_chart(self):
+    def generate_tls_vs_bandwidth_chart(self, tls_grouped, ax):
         """Generate Text Legibility Score vs. Presenter Bandwidth chart"""
         print("Generating TLS vs bandwidth chart...")
         
-        # Filter data for N=5 viewers and 0% packet loss
-        tls_data = self.data[(self.data['numViewers'] == 5) & (self.data['packetLoss'] == 0.0)].copy()
-        
-        if tls_data.empty:
+        if tls_grouped.empty:
             print("Warning: No data with 5 viewers and 0% packet loss found for TLS chart")
             return
         
-        # Group by architecture and bandwidth, calculate mean TLS
-        tls_grouped = tls_data.groupby(['architecture', 'bandwidth'])['avgTls'].mean().reset_index()
-        
-        # Convert bandwidth to numerical values for proper ordering
-        bandwidth_order = {'1mbit': 1, '2mbit': 2, '5mbit': 5}
-        tls_grouped['bandwidthNum'] = tls_grouped['bandwidth'].map(bandwidth_order)
-        tls_grouped = tls_grouped.sort_values('bandwidthNum')
-        
-        plt.figure(figsize=(10, 6))
+        ax.clear()
         
         # Plot bars for each architecture
         architectures = tls_grouped['architecture'].unique()
-        x = np.arange(len(tls_grouped['bandwidth'].unique()))
+        bandwidths = tls_grouped['bandwidth'].cat.remove_unused_categories().cat.categories
+        x = np.arange(len(bandwidths))
         width = 0.35
         
         for i, arch in enumerate(architectures):
+            # Align to the shared ticks; bandwidths this architecture lacks stay as NaN gaps
             arch_data = tls_grouped[tls_grouped['architecture'] == arch]
+            arch_tls = arch_data.set_index('bandwidth')['avgTls'].reindex(bandwidths)
             offset = width * (i - len(architectures)/2 + 0.5)
-            plt.bar(x + offset, arch_data['avgTls'], width, 
+            ax.bar(x + offset, arch_tls, width, 
                    label=f'{arch} Architecture', alpha=0.8)
         
-        plt.xlabel('Presenter Bandwidth', fontsize=12)
-        plt.ylabel('Text Legibility Score (Levenshtein Distance)', fontsize=12)
-        plt.title('Text Legibility Score (TLS) vs. Presenter Bandwidth\n(N=5 viewers, 0% packet loss)', 
-                 fontsize=14, fontweight='bold')
-        plt.xticks(x, ['1 Mbps', '2 Mbps', '5 Mbps'])
-        plt.legend(fontsize=11)
-        plt.grid(True, alpha=0.3, axis='y')
-        plt.tight_layout()
+        ax.set_xlabel('Presenter Bandwidth', fontsize=12)
+        ax.set_ylabel('Text Legibility Score (Levenshtein Distance)', fontsize=12)
+        ax.set_title('Text Legibility Score (TLS) vs. Presenter Bandwidth\n(N=5 viewers, 0% packet loss)', 
+                     fontsize=14, fontweight='bold')
+        ax.set_xticks(x, [BANDWIDTH_LABELS.get(bw, bw) for bw in bandwidths])
+        ax.legend(fontsize=11)
+        ax.grid(True, alpha=0.3, axis='y')
+        ax.figure.tight_layout()
         
         output_path = self.output_dir / 'tls_vs_bandwidth.png'
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        ax.figure.savefig(output_path, dpi=300, bbox_inches='tight')
         print(f"TLS vs bandwidth chart saved to {output_path}")
     
     def generate_summary_statistics(self):
         """Generate and save summary statistics"""
         print("Generating summary statistics...")
         
+        # One aggregation pass over the metric columns
+        overall = self.data[CUBE_METRICS].agg(['mean', 'std', 'min', 'max']).astype(float)
+        
         summary = {
             'total_tests': len(self.data),
-            'architectures': list(self.data['architecture'].unique()),
-            'viewer_counts': sorted(list(self.data['numViewers'].unique())),
-            'packet_loss_rates': sorted(list(self.data['packetLoss'].unique())),
-            'bandwidth_limits': list(self.data['bandwidth'].unique()),
+            'architectures': self.data['architecture'].unique().tolist(),
+            'viewer_counts': sorted(self.data['numViewers'].dropna().astype('int64').unique().tolist()),
+            'packet_loss_rates': sorted(self.data['packetLoss'].dropna().unique().tolist()),
+            'bandwidth_limits': self.data['bandwidth'].dropna().unique().tolist(),
             'overall_stats': {
-                'cpu_utilization': {
-                    'mean': float(self.data['avgCpu'].mean()),
-                    'std': float(self.data['avgCpu'].std()),
-                    'min': float(self.data['avgCpu'].min()),
-                    'max': float(self.data['avgCpu'].max())
-                },
-                'latency': {
-                    'mean': float(self.data['avgLatency'].mean()),
-                    'std': float(self.data['avgLatency'].std()),
-                    'min': float(self.data['avgLatency'].min()),
-                    'max': float(self.data['avgLatency'].max())
-                },
-                'tls': {
-                    'mean': float(self.data['avgTls'].mean()),
-                    'std': float(self.data['avgTls'].std()),
-                    'min': float(self.data['avgTls'].min()),
-                    'max': float(self.data['avgTls'].max())
-                }
+                SUMMARY_NAMES[metric]: overall[metric].to_dict() for metric in CUBE_METRICS
             }
         }
         
         # Architecture comparison
-        arch_comparison = {}
-        for arch in self.data['architecture'].unique():
-            arch_data = self.data[self.data['architecture'] == arch]
-            arch_comparison[arch] = {
-                'tests': len(arch_data),
-                'avg_cpu': float(arch_data['avgCpu'].mean()),
-                'avg_latency': float(arch_data['avgLatency'].mean()),
-                'avg_tls': float(arch_data['avgTls'].mean())
+        by_arch = self.data.groupby('architecture', observed=True)
+        arch_means = by_arch[CUBE_METRICS].mean().astype(float)
+        arch_tests = by_arch.size()
+        
+        summary['architecture_comparison'] = {
+            arch: {
+                'tests': int(arch_tests[arch]),
+                'avg_cpu': arch_means.at[arch, 'avgCpu'],
+                'avg_latency': arch_means.at[arch, 'avgLatency'],
+                'avg_tls': arch_means.at[arch, 'avgTls']
             }
-        
-        summary['architecture_comparison'] = arch_comparison
+            for arch in arch_means.index
+        }
         
         summary_file = self.output_dir / 'summary_statistics.json'
         with open(summary_file, 'w') as f:
@@ -249,9 +301,27 @@ class DataAnalyzer:
             self.load_data()
             
             if self.data is not None and not self.data.empty:
-                self.generate_cpu_utilization_chart()
-                self.generate_latency_vs_loss_chart()
-                self.generate_tls_vs_bandwidth_chart()
+                # Aggregate every test configuration in one pass, then slice the
+                # small cube for each chart instead of re-scanning the data
+                cube = self.aggregate_metrics()
+                no_loss = cube.index.get_level_values('packetLoss') == 0.0
+                five_viewers = cube.index.get_level_values('numViewers') == 5
+                known_bandwidth = cube.index.get_level_values('bandwidth') != MISSING_BANDWIDTH
+                
+                # All charts are drawn on a single reused figure
+                fig, ax = plt.subplots(figsize=(10, 6))
+                try:
+                    self.generate_cpu_utilization_chart(
+                        self.cube_means(cube[no_loss], ['architecture', 'numViewers'], 'avgCpu'), ax)
+                    self.generate_latency_vs_loss_chart(
+                        self.cube_means(cube[five_viewers], ['architecture', 'packetLoss'], 'avgLatency'), ax)
+                    # Bandwidth is an ordered categorical, so the TLS groups
+                    # come out in plotting order
+                    self.generate_tls_vs_bandwidth_chart(
+                        self.cube_means(cube[no_loss & five_viewers & known_bandwidth],
+                                        ['architecture', 'bandwidth'], 'avgTls'), ax)
+                finally:
+                    plt.close(fig)
                 summary = self.generate_summary_statistics()
                 
                 print("\n=== Analysis Complete ===")
@@ -3,10 +3,8 @@
 Simple visualization script using basic matplotlib
 """
 
-import csv
 import json
 import os
-from collections import defaultdict
 
 # Try to import required packages, install if missing
 try:
@@ -14,6 +12,7 @@ try:
     matplotlib.use('Agg')  # Use non-interactive backend
     import matplotlib.pyplot as plt
     import numpy as np
+    from numpy.lib import recfunctions as rfn
 except ImportError:
     print("Installing required packages...")
     import subprocess
@@ -23,56 +22,46 @@ except ImportError:
     matplotlib.use('Agg')
     import matplotlib.pyplot as plt
     import numpy as np
+    from numpy.lib import recfunctions as rfn
+
+# Integer codes for the architecture column
+ARCH_P2P = 0
+ARCH_SFU = 1
 
 def load_data():
     """Load test results from CSV file"""
-    data = []
     csv_file = 'results/results.csv'
     
     if not os.path.exists(csv_file):
         print(f"Error: {csv_file} not found")
         return []
     
-    with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert string values to appropriate types
-            row['numViewers'] = int(row['numViewers'])
-            row['packetLoss'] = float(row['packetLoss'])
-            row['avgLatency'] = float(row['avgLatency'])
-            row['avgCpu'] = float(row['avgCpu'])
-            row['avgTls'] = float(row['avgTls'])
-            data.append(row)
+    # Parse the whole file into typed columns in one call
+    data = np.atleast_1d(np.genfromtxt(csv_file, delimiter=',', names=True, dtype=None, encoding='utf-8'))
+    
+    # Encode architecture once so the charts can branch on integers
+    arch_code = np.where(np.char.lower(data['architecture'].astype(str)) == 'p2p', ARCH_P2P, ARCH_SFU).astype(np.int8)
+    data = rfn.append_fields(data, 'archCode', arch_code, usemask=False)
     
     print(f"Loaded {len(data)} test results")
     return data
 
+def group_means(keys, values):
+    """Mean of values for each distinct key, returned with the keys in sorted order"""
+    groups, codes = np.unique(keys, return_inverse=True)
+    return groups, np.bincount(codes, weights=values) / np.bincount(codes)
+
 def create_cpu_utilization_chart(data):
     """Generate CPU Utilization vs. Number of Viewers chart"""
     print("Creating CPU utilization chart...")
     
     # Filter for 0% packet loss
-    filtered_data = [d for d in data if d['packetLoss'] == 0.0]
-    
-    # Group by architecture and number of viewers
-    p2p_data = defaultdict(list)
-    sfu_data = defaultdict(list)
-    
-    for item in filtered_data:
-        viewers = item['numViewers']
-        cpu = item['avgCpu']
-        
-        if item['architecture'].lower() == 'p2p':
-            p2p_data[viewers].append(cpu)
-        else:  # SFU
-            sfu_data[viewers].append(cpu)
-    
-    # Calculate averages
-    p2p_viewers = sorted(p2p_data.keys())
-    p2p_cpu_avg = [np.mean(p2p_data[v]) for v in p2p_viewers]
+    filtered_data = data[data['packetLoss'] == 0.0]
+    is_p2p = filtered_data['archCode'] == ARCH_P2P
     
-    sfu_viewers = sorted(sfu_data.keys())
-    sfu_cpu_avg = [np.mean(sfu_data[v]) for v in sfu_viewers]
+    # Average CPU per viewer count for each architecture
+    p2p_viewers, p2p_cpu_avg = group_means(filtered_data['numViewers'][is_p2p], filtered_data['avgCpu'][is_p2p])
+    sfu_viewers, sfu_cpu_avg = group_means(filtered_data['numViewers'][~is_p2p], filtered_data['avgCpu'][~is_p2p])
     
     # Create plot
     plt.figure(figsize=(10, 6))
@@ -96,29 +85,16 @@ def create_latency_vs_loss_chart(data):
     print("Creating latency vs packet loss chart...")
     
     # Filter for 5 viewers
-    filtered_data = [d for d in data if d['numViewers'] == 5]
-    
-    # Group by architecture and packet loss
-    p2p_data = defaultdict(list)
-    sfu_data = defaultdict(list)
-    
-    for item in filtered_data:
-        loss = item['packetLoss']
-        latency = item['avgLatency']
-        
-        if item['architecture'].lower() == 'p2p':
-            p2p_data[loss].append(latency)
-        else:  # SFU
-            sfu_data[loss].append(latency)
-    
-    # Calculate averages and convert packet loss to percentage
-    p2p_losses = sorted(p2p_data.keys())
-    p2p_losses_pct = [l * 100 for l in p2p_losses]
-    p2p_latency_avg = [np.mean(p2p_data[l]) for l in p2p_losses]
-    
-    sfu_losses = sorted(sfu_data.keys())
-    sfu_losses_pct = [l * 100 for l in sfu_losses]
-    sfu_latency_avg = [np.mean(sfu_data[l]) for l in sfu_losses]
+    filtered_data = data[data['numViewers'] == 5]
+    is_p2p = filtered_data['archCode'] == ARCH_P2P
+    
+    # Average latency per packet loss rate for each architecture
+    p2p_losses, p2p_latency_avg = group_means(filtered_data['packetLoss'][is_p2p], filtered_data['avgLatency'][is_p2p])
+    sfu_losses, sfu_latency_avg = group_means(filtered_data['packetLoss'][~is_p2p], filtered_data['avgLatency'][~is_p2p])
+    
+    # Convert packet loss to percentage
+    p2p_losses_pct = p2p_losses * 100
+    sfu_losses_pct = sfu_losses * 100
     
     # Create plot
     plt.figure(figsize=(10, 6))
@@ -141,27 +117,19 @@ def create_tls_vs_bandwidth_chart(data):
     print("Creating TLS vs bandwidth chart...")
     
     # Filter for 5 viewers and 0% packet loss
-    filtered_data = [d for d in data if d['numViewers'] == 5 and d['packetLoss'] == 0.0]
-    
-    # Group by architecture and bandwidth
-    p2p_data = defaultdict(list)
-    sfu_data = defaultdict(list)
-    
-    for item in filtered_data:
-        bandwidth = item['bandwidth']
-        tls = item['avgTls']
-        
-        if item['architecture'].lower() == 'p2p':
-            p2p_data[bandwidth].append(tls)
-        else:  # SFU
-            sfu_data[bandwidth].append(tls)
+    filtered_data = data[(data['numViewers'] == 5) & (data['packetLoss'] == 0.0)]
+    is_p2p = filtered_data['archCode'] == ARCH_P2P
     
     # Define bandwidth order and labels
     bandwidth_order = ['1mbit', '2mbit', '5mbit']
     bandwidth_labels = ['1 Mbps', '2 Mbps', '5 Mbps']
     
-    p2p_tls_avg = [np.mean(p2p_data[bw]) for bw in bandwidth_order]
-    sfu_tls_avg = [np.mean(sfu_data[bw]) for bw in bandwidth_order]
+    # Average TLS per bandwidth for each architecture, in display order
+    p2p_tls = dict(zip(*group_means(filtered_data['bandwidth'][is_p2p], filtered_data['avgTls'][is_p2p])))
+    sfu_tls = dict(zip(*group_means(filtered_data['bandwidth'][~is_p2p], filtered_data['avgTls'][~is_p2p])))
+    
+    p2p_tls_avg = [p2p_tls.get(bw, np.nan) for bw in bandwidth_order]
+    sfu_tls_avg = [sfu_tls.get(bw, np.nan) for bw in bandwidth_order]
     
     # Create bar chart
     x = np.arange(len(bandwidth_labels))
@@ -193,15 +161,18 @@ def create_summary_stats(data):
         'performance_comparison': {}
     }
     
-    # Calculate average performance by architecture
-    for arch in ['P2P', 'SFU']:
-        arch_data = [d for d in data if d['architecture'].lower() == arch.lower()]
-        
+    # Calculate average performance by architecture with one reduction per metric
+    counts = np.bincount(data['archCode'], minlength=2)
+    cpu_avg = np.bincount(data['archCode'], weights=data['avgCpu'], minlength=2) / counts
+    latency_avg = np.bincount(data['archCode'], weights=data['avgLatency'], minlength=2) / counts
+    tls_avg = np.bincount(data['archCode'], weights=data['avgTls'], minlength=2) / counts
+    
+    for arch, arch_code in [('P2P', ARCH_P2P), ('SFU', ARCH_SFU)]:
         stats['performance_comparison'][arch] = {
-            'avg_cpu': np.mean([d['avgCpu'] for d in arch_data]),
-            'avg_latency': np.mean([d['avgLatency'] for d in arch_data]),
-            'avg_tls': np.mean([d['avgTls'] for d in arch_data]),
-            'test_count': len(arch_data)
+            'avg_cpu': cpu_avg[arch_code],
+            'avg_latency': latency_avg[arch_code],
+            'avg_tls': tls_avg[arch_code],
+            'test_count': int(counts[arch_code])
         }
     
     # Save statistics
@@ -217,7 +188,7 @@ def main():
     
     # Load data
     data = load_data()
-    if not data:
+    if len(data) == 0:
         print("No data found. Please run generate_fast_results.js first.")
         return
     
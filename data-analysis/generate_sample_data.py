@@ -4,96 +4,116 @@ Generate sample test data for development and testing purposes
 """
 
 import json
-import csv
-import random
 import numpy as np
+import pandas as pd
 from pathlib import Path
 import os
 
-def generate_sample_results():
-    """Generate realistic sample test results"""
+def generate_sample_metrics(rng=None):
+    """Generate realistic sample metrics for every test configuration as column arrays"""
+    rng = np.random.default_rng() if rng is None else rng
     
     # Test parameters
-    architectures = ['P2P', 'SFU']
-    num_viewers = [1, 2, 3, 4, 5, 8, 10, 15]
-    packet_loss_rates = [0, 0.01, 0.02, 0.05, 0.10]
-    bandwidth_limits = ['5mbit', '2mbit', '1mbit']
+    architectures = np.array(['P2P', 'SFU'])
+    num_viewers = np.array([1, 2, 3, 4, 5, 8, 10, 15])
+    packet_loss_rates = np.array([0, 0.01, 0.02, 0.05, 0.10])
+    bandwidth_limits = np.array(['5mbit', '2mbit', '1mbit'])
+    
+    # Full test grid, flattened in architecture > viewers > loss > bandwidth order
+    arch_idx, viewers, packet_loss, bw_idx = (axis.ravel() for axis in np.meshgrid(
+        np.arange(len(architectures)), num_viewers, packet_loss_rates,
+        np.arange(len(bandwidth_limits)), indexing='ij'))
+    is_p2p = architectures[arch_idx] == 'P2P'
+    n = len(arch_idx)
+    
+    # CPU usage: P2P scales linearly with viewers, SFU is more constant
+    base_cpu = np.where(is_p2p, 15 + (viewers - 1) * 8, 25 + viewers * 2)
+    avg_cpu = base_cpu * rng.uniform(0.8, 1.2, n)
+    max_cpu = avg_cpu * np.where(is_p2p, rng.uniform(1.2, 1.5, n), rng.uniform(1.1, 1.3, n))
+    
+    # Latency: affected by packet loss and architecture
+    base_latency = np.where(is_p2p, 50, 80)
+    packet_loss_impact = packet_loss * 200  # ms increase per % loss
+    bandwidth_impact = np.array([0, 10, 25])[bw_idx]
+    viewer_impact = np.where(is_p2p, viewers * 2, viewers * 0.5)
+    
+    avg_latency = base_latency + packet_loss_impact + bandwidth_impact + viewer_impact
+    avg_latency *= rng.uniform(0.8, 1.2, n)
+    min_latency = avg_latency * rng.uniform(0.6, 0.8, n)
+    max_latency = avg_latency * rng.uniform(1.3, 1.8, n)
+    
+    # TLS: lower bandwidth = higher score (worse quality)
+    base_tls = np.array([0.05, 0.12, 0.25])[bw_idx]
+    packet_loss_impact = packet_loss * 0.3
+    architecture_impact = np.where(is_p2p, 0.02, 0.01)
+    
+    avg_tls = base_tls + packet_loss_impact + architecture_impact
+    avg_tls *= rng.uniform(0.7, 1.3, n)
+    min_tls = avg_tls * rng.uniform(0.5, 0.8, n)
+    
+    test_id = np.arange(1, n + 1)
+    
+    return {
+        'testId': test_id,
+        'architecture': architectures[arch_idx],
+        'numViewers': viewers,
+        'packetLoss': packet_loss,
+        'bandwidth': bandwidth_limits[bw_idx],
+        'avgLatency': avg_latency,
+        'minLatency': min_latency,
+        'maxLatency': max_latency,
+        'medianLatency': avg_latency * rng.uniform(0.9, 1.1, n),
+        'latencyCount': rng.integers(100, 121, n),
+        'avgCpu': avg_cpu,
+        'maxCpu': max_cpu,
+        'avgTls': avg_tls,
+        'minTls': min_tls,
+        'maxTls': avg_tls * rng.uniform(1.2, 2.0, n),
+        'timestamp': 1700000000000 + test_id * 60000
+    }
+
+def generate_sample_results(metrics=None):
+    """Generate realistic sample test results"""
+    metrics = generate_sample_metrics() if metrics is None else metrics
+    
+    # Convert the metric columns to native Python types for JSON serialization
+    columns = {name: values.tolist() for name, values in metrics.items()}
     
     results = []
-    test_id = 1
-    
-    for architecture in architectures:
-        for viewers in num_viewers:
-            for packet_loss in packet_loss_rates:
-                for bandwidth in bandwidth_limits:
-                    # Simulate realistic metrics based on conditions
-                    
-                    # CPU usage: P2P scales linearly with viewers, SFU is more constant
-                    if architecture == 'P2P':
-                        base_cpu = 15 + (viewers - 1) * 8
-                        cpu_variation = random.uniform(0.8, 1.2)
-                        avg_cpu = base_cpu * cpu_variation
-                        max_cpu = avg_cpu * random.uniform(1.2, 1.5)
-                    else:  # SFU
-                        base_cpu = 25 + viewers * 2
-                        cpu_variation = random.uniform(0.8, 1.2)
-                        avg_cpu = base_cpu * cpu_variation
-                        max_cpu = avg_cpu * random.uniform(1.1, 1.3)
-                    
-                    # Latency: affected by packet loss and architecture
-                    base_latency = 50 if architecture == 'P2P' else 80
-                    packet_loss_impact = packet_loss * 200  # ms increase per % loss
-                    bandwidth_impact = {'5mbit': 0, '2mbit': 10, '1mbit': 25}[bandwidth]
-                    viewer_impact = viewers * 2 if architecture == 'P2P' else viewers * 0.5
-                    
-                    avg_latency = base_latency + packet_loss_impact + bandwidth_impact + viewer_impact
-                    avg_latency *= random.uniform(0.8, 1.2)
-                    min_latency = avg_latency * random.uniform(0.6, 0.8)
-                    max_latency = avg_latency * random.uniform(1.3, 1.8)
-                    
-                    # TLS: lower bandwidth = higher score (worse quality)
-                    base_tls = {'5mbit': 0.05, '2mbit': 0.12, '1mbit': 0.25}[bandwidth]
-                    packet_loss_impact = packet_loss * 0.3
-                    architecture_impact = 0.02 if architecture == 'P2P' else 0.01
-                    
-                    avg_tls = base_tls + packet_loss_impact + architecture_impact
-                    avg_tls *= random.uniform(0.7, 1.3)
-                    min_tls = avg_tls * random.uniform(0.5, 0.8)
-                    
-                    # Create result record
-                    result = {
-                        'testId': test_id,
-                        'architecture': architecture.lower(),
-                        'numViewers': viewers,
-                        'packetLoss': packet_loss,
-                        'bandwidth': bandwidth,
-                        'success': True,
-                        'sessionId': f'test-{test_id}-sample',
-                        'timestamp': 1700000000000 + test_id * 60000,
-                        'completedAt': 1700000000000 + test_id * 60000 + 60000,
-                        'metrics': {
-                            'latency': {
-                                'average': avg_latency,
-                                'min': min_latency,
-                                'max': max_latency,
-                                'median': avg_latency * random.uniform(0.9, 1.1),
-                                'count': random.randint(100, 120)
-                            },
-                            'cpu': {
-                                'average': avg_cpu,
-                                'min': avg_cpu * 0.3,
-                                'max': max_cpu
-                            },
-                            'tls': {
-                                'average': avg_tls,
-                                'min': min_tls,
-                                'max': avg_tls * random.uniform(1.2, 2.0)
-                            }
-                        }
-                    }
-                    
-                    results.append(result)
-                    test_id += 1
+    for i, test_id in enumerate(columns['testId']):
+        # Create result record
+        result = {
+            'testId': test_id,
+            'architecture': columns['architecture'][i].lower(),
+            'numViewers': columns['numViewers'][i],
+            'packetLoss': columns['packetLoss'][i],
+            'bandwidth': columns['bandwidth'][i],
+            'success': True,
+            'sessionId': f'test-{test_id}-sample',
+            'timestamp': columns['timestamp'][i],
+            'completedAt': columns['timestamp'][i] + 60000,
+            'metrics': {
+                'latency': {
+                    'average': columns['avgLatency'][i],
+                    'min': columns['minLatency'][i],
+                    'max': columns['maxLatency'][i],
+                    'median': columns['medianLatency'][i],
+                    'count': columns['latencyCount'][i]
+                },
+                'cpu': {
+                    'average': columns['avgCpu'][i],
+                    'min': columns['avgCpu'][i] * 0.3,
+                    'max': columns['maxCpu'][i]
+                },
+                'tls': {
+                    'average': columns['avgTls'][i],
+                    'min': columns['minTls'][i],
+                    'max': columns['maxTls'][i]
+                }
+            }
+        }
+        
+        results.append(result)
     
     return results
 
@@ -102,8 +122,9 @@ def save_sample_data(results_dir='./results'):
     results_path = Path(results_dir)
     results_path.mkdir(exist_ok=True)
     
-    # Generate sample results
-    results = generate_sample_results()
+    # Generate sample metrics and the JSON records built from them
+    metrics = generate_sample_metrics()
+    results = generate_sample_results(metrics)
     
     # Save JSON format
     json_data = {
@@ -121,32 +142,26 @@ def save_sample_data(results_dir='./results'):
     with open(json_file, 'w') as f:
         json.dump(json_data, f, indent=2)
     
-    # Save CSV format
-    csv_data = []
-    for result in results:
-        csv_row = {
-            'testId': result['testId'],
-            'architecture': result['architecture'].upper(),
-            'numViewers': result['numViewers'],
-            'packetLoss': result['packetLoss'],
-            'bandwidth': result['bandwidth'],
-            'success': result['success'],
-            'avgLatency': result['metrics']['latency']['average'],
-            'minLatency': result['metrics']['latency']['min'],
-            'maxLatency': result['metrics']['latency']['max'],
-            'avgCpu': result['metrics']['cpu']['average'],
-            'maxCpu': result['metrics']['cpu']['max'],
-            'avgTls': result['metrics']['tls']['average'],
-            'minTls': result['metrics']['tls']['min'],
-            'timestamp': result['timestamp']
-        }
-        csv_data.append(csv_row)
+    # Save CSV format straight from the metric columns
+    csv_data = pd.DataFrame({
+        'testId': metrics['testId'],
+        'architecture': metrics['architecture'],
+        'numViewers': metrics['numViewers'],
+        'packetLoss': metrics['packetLoss'],
+        'bandwidth': metrics['bandwidth'],
+        'success': True,
+        'avgLatency': metrics['avgLatency'],
+        'minLatency': metrics['minLatency'],
+        'maxLatency': metrics['maxLatency'],
+        'avgCpu': metrics['avgCpu'],
+        'maxCpu': metrics['maxCpu'],
+        'avgTls': metrics['avgTls'],
+        'minTls': metrics['minTls'],
+        'timestamp': metrics['timestamp']
+    })
     
     csv_file = results_path / 'results.csv'
-    with open(csv_file, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=csv_data[0].keys())
-        writer.writeheader()
-        writer.writerows(csv_data)
+    csv_data.to_csv(csv_file, index=False)
     
     print(f"Sample data generated:")
     print(f"  - {json_file}")